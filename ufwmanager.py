@@ -4,9 +4,29 @@ import curses
 import subprocess
 import re
 import os
+import select
+import sys
+import threading
 from datetime import datetime
 from typing import List, Optional, Tuple
 
+_RULE_LINE_RE = re.compile(r'(\[\s*\d+\])\s+(.*)')
+_PORT_RE = re.compile(r'(\d+)')
+_ACTION_RE_LOWER = re.compile(r'\b(allow|deny|reject|limit)\b(\s+in)?(\s+out)?')
+_ACTION_RE_UPPER = re.compile(r'\b(ALLOW|DENY|REJECT|LIMIT)\b(\s+IN)?(\s+OUT)?')
+
+_ACTIONS, _PROTOCOLS, _DIRECTIONS = ["allow", "deny", "reject", "limit"], ["tcp", "udp", "any"], ["in", "out"]
+_ACTION_IDX = {action: i for i, action in enumerate(_ACTIONS)}
+_DIRECTION_IDX = {direction: i for i, direction in enumerate(_DIRECTIONS)}
+
+# Columns: [#] 5, TO 17, ACTION 12, FROM/TO 15, SERVICE 18, NOTE
+_ROW_FMT = "{:<5} {:<17} {:<12} {:<15} {:<18} {}".format
+_HEADER_STR = _ROW_FMT('[#]', 'TO', 'ACTION', 'FROM/TO', 'SERVICE', 'NOTE')
+
+def _rule_signature(rule_details: str) -> str:
+    """Returns a key for a rule that, unlike its number, survives inserts and deletes."""
+    return " ".join(rule_details.split())
+
 class UFWManager:
     """
     A terminal-based TUI for managing the UFW (Uncomplicated Firewall).
@@ -16,164 +36,279 @@ class UFWManager:
         self.selected_index = 0
         self.scroll_pos = 0
         self.status_message = "Welcome to UFW Manager! Press 'R' to load/reload rules."
+        self._dirty = True # Set when anything other than the clock needs repainting
+        self._footer_message = "" # Status text currently shown in the footer
         
         # Data
-        self.rules: List[List[str]] = []
+        # Each rule: [label e.g. "[ 1]", to, action, from, signature, rule number]
+        self.rules: List[list] = []
+        self._formatted_rows: List[str] = []
         self.ufw_status = "inactive"
+        self._pending_proc: Optional[subprocess.Popen] = None
+        self._pending_output: List[bytes] = []
         
         self.notes_dir = os.path.expanduser("~/.config/ufwnotes")
         self.notes_file = os.path.join(self.notes_dir, "notes.txt")
         self.services_file = os.path.join(self.notes_dir, "services.txt")
         self.notes: dict[str, str] = {}
         self.services: dict[str, str] = {}
-        self._setup_and_load_files()
+        # Entries from the old "<rule number>:<text>" format, migrated once rules are loaded.
+        self._legacy_entries: dict[str, dict[str, str]] = {}
+        # Loaded in the background by run() while UFW is queried; joined before the first draw.
+        self._files_loader: Optional[threading.Thread] = None
 
     # --- UFW & Notes Core Functions ---
 
-    def _run_command(self, command: str, needs_input: Optional[str] = None) -> subprocess.CompletedProcess:
-        """A helper to run shell commands and handle sudo."""
-        if needs_input:
-            command = f"echo '{needs_input}' | {command}"
-        
-        return subprocess.run(
-            command, 
-            shell=True, 
-            check=True, 
-            capture_output=True, 
-            text=True
-        )
+    def _run_command(self, argv: List[str], needs_input: Optional[str] = None) -> subprocess.CompletedProcess:
+        """A helper to run a command (without a shell), optionally feeding it input on stdin."""
+        try:
+            return subprocess.run(
+                argv,
+                check=True,
+                capture_output=True,
+                text=True,
+                input=needs_input
+            )
+        except FileNotFoundError as e:
+            raise subprocess.CalledProcessError(127, argv, stderr=str(e)) from e
 
     def _setup_and_load_files(self):
         """Creates the notes/services directory/files if needed, then loads them."""
         try:
             os.makedirs(self.notes_dir, exist_ok=True)
-            for file_path, data_dict in [(self.notes_file, self.notes), (self.services_file, self.services)]:
+        except (OSError, PermissionError) as e:
+            self.status_message = f"Error with config files: {e}"
+        for file_path, data_dict in [(self.notes_file, self.notes), (self.services_file, self.services)]:
+            data_dict.clear()
+            try:
                 if not os.path.isfile(file_path):
                     open(file_path, 'a').close()
-                
-                data_dict.clear()
                 with open(file_path, 'r') as f:
-                    for line in f:
-                        if ':' in line:
-                            num, text = line.split(':', 1)
-                            if num.strip().isdigit():
-                                data_dict[num.strip()] = text.strip()
-        except (OSError, PermissionError) as e:
-            self.status_message = f"Error with config files: {e}"
+                    lines = f.read().splitlines()
+            except (OSError, PermissionError) as e:
+                self.status_message = f"Error with config files: {e}"
+                continue
+
+            for line in lines:
+                signature, sep, text = line.partition('\t')
+                if sep:
+                    data_dict[signature.strip()] = text.strip()
+                    continue
+                num, sep, text = line.partition(':')
+                num = num.strip()
+                if sep and num.isdigit():
+                    self._legacy_entries.setdefault(file_path, {})[num] = text.strip()
 
     def _save_notes_or_services(self, file_path: str, data_dict: dict):
         """Saves a given dictionary to its corresponding file."""
         try:
             with open(file_path, 'w') as f:
-                valid_items = [item for item in data_dict.items() if item[0].isdigit()]
-                for num, text in sorted(valid_items, key=lambda item: int(item[0])):
-                    f.write(f"{num}:{text}\n")
+                for signature, text in sorted(data_dict.items()):
+                    f.write(f"{signature}\t{text}\n")
         except (OSError, PermissionError) as e:
             self.status_message = f"Error saving to {os.path.basename(file_path)}: {e}"
+
+    def _migrate_legacy_entries(self):
+        """Re-keys notes/services saved by rule number to the signature of the rule now at that number."""
+        signatures = {rule[5]: rule[4] for rule in self.rules}
+        for file_path, data_dict in [(self.notes_file, self.notes), (self.services_file, self.services)]:
+            legacy = self._legacy_entries.pop(file_path, None)
+            if not legacy: continue
+            for num, text in legacy.items():
+                if int(num) in signatures: data_dict.setdefault(signatures[int(num)], text)
+            self._save_notes_or_services(file_path, data_dict)
             
+    def _parse_firewall_rules(self, output: str):
+        """Parses the output of 'ufw status numbered' into the status and rule list."""
+        lines = output.strip().split('\n')
+        status_line = next((line for line in lines if "Status:" in line), "Status: inactive")
+        self.ufw_status = status_line.split(':')[1].strip()
+        
+        self.rules = []
+        for line in lines:
+            line = line.strip()
+            if not line or line[0] != '[': continue
+            match = _RULE_LINE_RE.match(line)
+            if not match: continue
+
+            rule_details = match.group(2)
+            to_part, action_part, from_part = rule_details, "", ""
+            action_match = None
+            if 'ALLOW' in rule_details or 'DENY' in rule_details or 'REJECT' in rule_details or 'LIMIT' in rule_details:
+                action_match = _ACTION_RE_UPPER.search(rule_details)
+            if action_match:
+                action_str = action_match.group(0)
+                parts = rule_details.split(action_str, 1)
+                to_part = parts[0].strip()
+                action_part = action_str.strip()
+                from_part = parts[1].strip().split()[0]
+            rule_label = match.group(1)
+            self.rules.append([rule_label, to_part, action_part, from_part, _rule_signature(rule_details), int(rule_label[1:-1])])
+
+        self.selected_index = min(self.selected_index, max(0, len(self.rules) - 1))
+        if not self.rules:
+            self.status_message = "UFW is active, but no rules are configured."
+        elif self._legacy_entries:
+            self._migrate_legacy_entries()
+        self._format_rows()
+
+    def _format_rows(self):
+        """Pre-renders each rule's display line; call whenever rules, notes or services change."""
+        self._formatted_rows = []
+        for rule_num, to_part, action_part, from_part, signature, _ in self.rules:
+            note_display = "Yes" if signature in self.notes else "No"
+            service = self.services.get(signature, "")
+            self._formatted_rows.append(_ROW_FMT(rule_num, to_part, action_part, from_part, service, note_display))
+
+    def _set_firewall_error(self):
+        self.ufw_status = "error"
+        self.rules = []
+        self._formatted_rows = []
+        self.status_message = "Error fetching UFW status. Is it installed and enabled?"
+
     def _get_firewall_rules(self):
-        """Fetches and parses numbered UFW rules and status."""
+        """Fetches and parses numbered UFW rules and status, blocking until done."""
+        self._poll_status(block=True)
         try:
-            result = self._run_command("sudo ufw status numbered")
-            lines = result.stdout.strip().split('\n')
-            status_line = next((line for line in lines if "Status:" in line), "Status: inactive")
-            self.ufw_status = status_line.split(':')[1].strip()
-            
-            self.rules = []
-            for line in lines:
-                line = line.strip()
-                match = re.match(r'(\[\s*\d+\])\s+(.*)', line)
-                if match:
-                    self.rules.append([match.group(1), match.group(2)])
-
-            if not self.rules:
-                self.status_message = "UFW is active, but no rules are configured."
+            result = self._run_command(['sudo', 'ufw', 'status', 'numbered'])
+            self._parse_firewall_rules(result.stdout)
         except subprocess.CalledProcessError:
-            self.ufw_status = "error"
-            self.rules = []
-            self.status_message = "Error fetching UFW status. Is it installed and enabled?"
+            self._set_firewall_error()
+
+    def _kickoff_status(self):
+        """Starts fetching UFW rules in the background; see _poll_status."""
+        self._poll_status(block=True)
+        self._pending_output = []
+        try:
+            self._pending_proc = subprocess.Popen(
+                # -n: never prompt, as the main loop would read the password keystrokes as commands
+                ['sudo', '-n', 'ufw', 'status', 'numbered'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            self._pending_proc = None
+            self._set_firewall_error()
+
+    def _poll_status(self, block: bool = False):
+        """Applies the result of a background status fetch once it has finished (or waits for it if block is set)."""
+        if self._pending_proc is None:
+            return
+        # Drain the pipe as data arrives; a large rule set would otherwise fill it and stall ufw.
+        fd = self._pending_proc.stdout.fileno()
+        while True:
+            ready, _, _ = select.select([fd], [], [], None if block else 0)
+            if not ready: return
+            chunk = os.read(fd, 65536)
+            if not chunk: break
+            self._pending_output.append(chunk)
+
+        self._pending_proc.stdout.close()
+        returncode = self._pending_proc.wait()
+        output = b''.join(self._pending_output).decode(errors='replace')
+        self._pending_proc, self._pending_output = None, []
+        self._dirty = True
+        if returncode == 0:
+            self._parse_firewall_rules(output)
+        else:
+            # Most likely sudo -n found no cached credentials (or ufw itself failed); retry in the
+            # foreground, where sudo may prompt and real errors are reported as before.
+            self._get_firewall_rules()
 
     def _reload_firewall(self):
         """Reloads the UFW firewall and refreshes the rule list."""
         try:
-            self._run_command("sudo ufw reload")
+            self._run_command(['sudo', 'ufw', 'reload'])
             self.status_message = "Firewall reloaded successfully."
         except subprocess.CalledProcessError as e:
             self.status_message = f"Error reloading firewall: {e.stderr.strip()}"
-        self._get_firewall_rules()
+        self._kickoff_status()
 
     def _delete_firewall_rule(self, stdscr):
         """Deletes the currently selected firewall rule and its associated note/service."""
+        self._poll_status(block=True) # Rule numbers must come from the current list, not a stale one
         if not self.rules or self.selected_index >= len(self.rules):
             self.status_message = "No rule selected to delete."
             return
         
-        rule_num_str = self.rules[self.selected_index][0].strip('[] ')
-        if not rule_num_str.isdigit():
-             self.status_message = "This line is not a deletable rule."
-             return
-             
+        rule_num_str = str(self.rules[self.selected_index][5])
         if self._confirm_action(stdscr, f"Delete rule #{rule_num_str}?"):
             try:
-                self._run_command(f"sudo ufw delete {rule_num_str}", needs_input='y')
+                self._run_command(['sudo', 'ufw', 'delete', rule_num_str], needs_input='y\n')
                 self.status_message = f"Rule {rule_num_str} deleted successfully."
                 
-                deleted_num = int(rule_num_str)
+                signature = self.rules[self.selected_index][4]
                 for data_dict, file_path in [(self.notes, self.notes_file), (self.services, self.services_file)]:
-                    new_data = {}
-                    for num_str, text in data_dict.items():
-                        num = int(num_str)
-                        if num == deleted_num: continue
-                        if num > deleted_num: new_data[str(num - 1)] = text
-                        else: new_data[num_str] = text
-                    if data_dict == self.notes: self.notes = new_data
-                    else: self.services = new_data
-                    self._save_notes_or_services(file_path, new_data)
+                    if data_dict.pop(signature, None) is not None:
+                        self._save_notes_or_services(file_path, data_dict)
+                self._format_rows()
 
                 self.selected_index = max(0, self.selected_index - 1)
-                self._get_firewall_rules()
+                self._kickoff_status()
             except subprocess.CalledProcessError as e:
                 self.status_message = f"Error deleting rule: {e.stderr.strip()}"
+                self._kickoff_status()
 
     def _add_or_edit_rule(self, stdscr, is_edit: bool = False):
         """Opens a window to add or edit a rule, then applies it."""
+        self._poll_status(block=True) # Rule numbers must come from the current list, not a stale one
         rule_to_edit = None
         old_rule_num = None
         if is_edit:
             if not self.rules or self.selected_index >= len(self.rules):
                 self.status_message = "No rule selected to edit."; return
             rule_to_edit = self.rules[self.selected_index]
-            old_rule_num = rule_to_edit[0].strip('[] ')
+            old_rule_num = rule_to_edit[5]
 
         result = self._get_rule_input_from_form(stdscr, rule_to_edit)
         if result:
             new_rule_command, service_text, note_text = result
             try:
                 if is_edit:
-                    self._run_command(f"sudo ufw delete {old_rule_num}", needs_input='y')
-                    self._run_command(f"sudo ufw insert {old_rule_num} {new_rule_command}")
-                    
-                    for num, text, data_dict, file_path in [(old_rule_num, service_text, self.services, self.services_file), (old_rule_num, note_text, self.notes, self.notes_file)]:
-                        if text: data_dict[num] = text
-                        elif num in data_dict: del data_dict[num]
+                    self._run_command(['sudo', 'ufw', 'delete', str(old_rule_num)], needs_input='y\n')
+                    self._run_command(['sudo', 'ufw', 'insert', str(old_rule_num), *new_rule_command.split()])
+
+                    self._get_firewall_rules()
+                    old_signature = rule_to_edit[4]
+                    new_signature = next((r[4] for r in self.rules if r[5] == old_rule_num), None)
+                    changed = []
+                    for text, data_dict, file_path in [(service_text, self.services, self.services_file), (note_text, self.notes, self.notes_file)]:
+                        old_text = data_dict.pop(old_signature, None)
+                        if text and new_signature: data_dict[new_signature] = text
+                        if old_text is not None or (text and new_signature):
+                            changed.append((file_path, data_dict))
+                    for file_path, data_dict in changed:
                         self._save_notes_or_services(file_path, data_dict)
+                    self._format_rows()
                 else:
-                    old_rules_set = {tuple(r) for r in self.rules}
-                    self._run_command(f"sudo ufw {new_rule_command}")
+                    old_rules = self.rules
+                    self._run_command(['sudo', 'ufw', *new_rule_command.split()])
                     
                     self._get_firewall_rules()
-                    new_rules_set = {tuple(r) for r in self.rules}
-                    added_rules = new_rules_set - old_rules_set
+                    if len(self.rules) == len(old_rules) + 1:
+                        # A single new rule: it sits wherever the two lists first differ (the end for
+                        # plain appends, but UFW keeps v4 rules ahead of v6 ones).
+                        added_idx = next((i for i, rule in enumerate(old_rules) if rule[4] != self.rules[i][4]), len(old_rules))
+                        added_rule = self.rules[added_idx]
+                    else:
+                        old_signatures = {rule[4] for rule in old_rules}
+                        added_rule = next((rule for rule in self.rules if rule[4] not in old_signatures), None)
                     
-                    if added_rules:
-                        new_rule_num = added_rules.pop()[0].strip('[] ')
-                        if service_text: self.services[new_rule_num] = service_text; self._save_notes_or_services(self.services_file, self.services)
-                        if note_text: self.notes[new_rule_num] = note_text; self._save_notes_or_services(self.notes_file, self.notes)
+                    if added_rule:
+                        new_signature = added_rule[4]
+                        changed = []
+                        for text, data_dict, file_path in [(service_text, self.services, self.services_file), (note_text, self.notes, self.notes_file)]:
+                            if text:
+                                data_dict[new_signature] = text
+                                changed.append((file_path, data_dict))
+                        for file_path, data_dict in changed:
+                            self._save_notes_or_services(file_path, data_dict)
+                        self._format_rows()
 
                 self.status_message = "Rule applied successfully."
-                self._get_firewall_rules()
             except subprocess.CalledProcessError as e:
                 self.status_message = f"Error applying rule: {e.stderr.strip()}"
+                self._kickoff_status() # An edit may have deleted the old rule before the insert failed
 
     def _panic_mode(self, stdscr):
         """Displays a confirmation window for resetting the firewall."""
@@ -203,11 +338,12 @@ class UFWManager:
             key = win.getch()
             if key in [curses.KEY_ENTER, 10, 13]:
                 try:
-                    self._run_command("sudo ufw reset", needs_input='y')
+                    self._run_command(['sudo', 'ufw', 'reset'], needs_input='y\n')
                     self.status_message = "Firewall has been reset to default."
-                    self._get_firewall_rules()
+                    self._kickoff_status()
                 except subprocess.CalledProcessError as e:
                     self.status_message = f"Error resetting firewall: {e.stderr.strip()}"
+                    self._kickoff_status()
                 break
             elif key == 27: # Escape key
                 self.status_message = "Panic mode aborted."
@@ -240,21 +376,22 @@ class UFWManager:
         win.keypad(True)
         win.addstr(1, 2, "Add/Edit UFW Rule (Use ←/→ for dropdowns)", curses.A_BOLD)
         
-        actions, protocols, directions = ["allow", "deny", "reject", "limit"], ["tcp", "udp", "any"], ["in", "out"]
+        actions, protocols, directions = _ACTIONS, _PROTOCOLS, _DIRECTIONS
         fields = {"Action": [actions, 0], "Direction": [directions, 0], "Protocol": [protocols, 0], "Port": "", "From/To IP": "any", "Service": "", "Note": ""}
         field_order = ["Action", "Direction", "Protocol", "Port", "From/To IP", "Service", "Note"]
         
         if existing_rule:
-            rule_num = existing_rule[0].strip('[] ')
-            rule_text = existing_rule[1].lower()
-            for i, action in enumerate(actions):
-                if action in rule_text: fields["Action"][1] = i
-            for i, direction in enumerate(directions):
-                if f" {direction} " in rule_text: fields["Direction"][1] = i
-            port_match = re.search(r'(\d+)', rule_text)
+            signature = existing_rule[4]
+            rule_text = signature.lower()
+            tokens = rule_text.split()
+            for tok in tokens:
+                if tok in _ACTION_IDX: fields["Action"][1] = _ACTION_IDX[tok]; break
+            for tok in tokens:
+                if tok in _DIRECTION_IDX: fields["Direction"][1] = _DIRECTION_IDX[tok]; break
+            port_match = _PORT_RE.search(rule_text)
             if port_match: fields["Port"] = port_match.group(1)
             
-            action_match = re.search(r'\b(allow|deny|reject|limit)\b(\s+in)?(\s+out)?', rule_text)
+            action_match = _ACTION_RE_LOWER.search(rule_text)
             if action_match:
                 action_str = action_match.group(0)
                 from_part = rule_text.split(action_str, 1)[1].strip()
@@ -262,48 +399,48 @@ class UFWManager:
                 if from_ip and from_ip.lower() != 'anywhere':
                     fields["From/To IP"] = from_ip
 
-            fields["Service"] = self.services.get(rule_num, "")
-            fields["Note"] = self.notes.get(rule_num, "")
+            fields["Service"] = self.services.get(signature, "")
+            fields["Note"] = self.notes.get(signature, "")
+
+        def draw_field(i: int):
+            name, y_offset = field_order[i], 3 + i * 2
+            value = fields[name]
+
+            attr = curses.A_REVERSE if i == current_field_idx else curses.A_NORMAL
+            win.addstr(y_offset, 2, f"{name.ljust(10)}:", attr)
+            
+            win.attron(curses.color_pair(6))
+            if name == "Action":
+                display_val = f"< {value[0][value[1]]} >"
+                win.addstr(y_offset, 14, f"{display_val:<10}")
+            elif name in ["Direction", "Protocol"]:
+                display_val = f"< {value[0][value[1]]} >"
+                win.addstr(y_offset, 14, f"{display_val:<7}")
+            elif name == "Port":
+                win.addstr(y_offset, 14, f"{value:<5}")
+            elif name == "From/To IP":
+                win.addstr(y_offset, 14, f"{value:<15}")
+            elif name == "Service":
+                win.addstr(y_offset, 14, f"{value:<18}")
+            else: # Note
+                win.addstr(y_offset, 14, f"{value:<43}")
+            win.attroff(curses.color_pair(6))
+            
+            win.hline(y_offset + 1, 2, curses.ACS_HLINE, 56)
 
         current_field_idx = 0
+        for i in range(len(field_order)): draw_field(i)
+        win.addstr(3 + len(field_order) * 2, 2, "ESC - Close without saving | Enter - Save & close", curses.A_DIM)
+
         curses.curs_set(1)
         while True:
-            y_offset = 3
-            for i, name in enumerate(field_order):
-                value = fields[name]
-                is_dropdown = isinstance(value, list)
-                
-                attr = curses.A_REVERSE if i == current_field_idx else curses.A_NORMAL
-                win.addstr(y_offset, 2, f"{name.ljust(10)}:", attr)
-                
-                win.attron(curses.color_pair(6))
-                if name == "Action":
-                    display_val = f"< {value[0][value[1]]} >"
-                    win.addstr(y_offset, 14, f"{display_val:<10}")
-                elif name in ["Direction", "Protocol"]:
-                    display_val = f"< {value[0][value[1]]} >"
-                    win.addstr(y_offset, 14, f"{display_val:<7}")
-                elif name == "Port":
-                    win.addstr(y_offset, 14, f"{value:<5}")
-                elif name == "From/To IP":
-                    win.addstr(y_offset, 14, f"{value:<15}")
-                elif name == "Service":
-                    win.addstr(y_offset, 14, f"{value:<18}")
-                else: # Note
-                    win.addstr(y_offset, 14, f"{value:<43}")
-                win.attroff(curses.color_pair(6))
-                
-                win.hline(y_offset + 1, 2, curses.ACS_HLINE, 56)
-                y_offset += 2
-
-            win.addstr(y_offset, 2, "ESC - Close without saving | Enter - Save & close", curses.A_DIM)
-
             current_field_name = field_order[current_field_idx]
             if not isinstance(fields[current_field_name], list):
                 win.move(3 + (current_field_idx * 2), 14 + len(fields[current_field_name]))
             
-            win.refresh()
+            win.noutrefresh(); curses.doupdate()
             key = win.getch()
+            prev_idx = current_field_idx
             
             if key in [curses.KEY_ENTER, 10, 13]: break
             if key == 27: return None
@@ -322,6 +459,10 @@ class UFWManager:
                     if current_field_name == "Service" and len(fields[current_field_name]) >= 18: continue
                     if current_field_name == "Note" and len(fields[current_field_name]) >= 43: continue
                     fields[current_field_name] += chr(key)
+
+            # Only the edited field and, on focus moves, the previously focused one need repainting
+            draw_field(prev_idx)
+            if current_field_idx != prev_idx: draw_field(current_field_idx)
         
         curses.curs_set(0)
         
@@ -346,11 +487,15 @@ class UFWManager:
         curses.init_pair(5, curses.COLOR_WHITE, curses.COLOR_BLUE)
         curses.init_pair(6, curses.COLOR_WHITE, curses.COLOR_RED) # For editable fields
 
+    def _draw_clock(self, stdscr, width: int):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        stdscr.addstr(0, (width - len(timestamp)) - 2, timestamp)
+
     def _draw_header(self, stdscr, width: int):
-        timestamp, title = datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "UFW Firewall Manager"
+        title = "UFW Firewall Manager"
         status_text, status_color = f"Status: {self.ufw_status.upper()}", 1 if self.ufw_status == 'active' else 2
         stdscr.attron(curses.color_pair(4) | curses.A_BOLD); stdscr.addstr(0, 2, title); stdscr.attroff(curses.color_pair(4) | curses.A_BOLD)
-        stdscr.addstr(0, (width - len(timestamp)) - 2, timestamp)
+        self._draw_clock(stdscr, width)
         stdscr.attron(curses.color_pair(status_color) | curses.A_BOLD); stdscr.addstr(0, (width - len(status_text)) // 2, status_text); stdscr.attroff(curses.color_pair(status_color) | curses.A_BOLD)
 
     def _draw_main_window(self, stdscr, height: int, width: int):
@@ -358,50 +503,19 @@ class UFWManager:
         
         if self.ufw_status == 'error': win.addstr(2, 2, "Could not get UFW status. Is it installed?", curses.color_pair(2)); win.refresh(); return
 
-        col_widths = {'#': 5, 'TO': 17, 'ACTION': 12, 'FROM/TO': 15, 'SERVICE': 18, 'NOTE': 5}
-        header_str = (f"{'[#]':<{col_widths['#']}} "
-                      f"{'TO':<{col_widths['TO']}} "
-                      f"{'ACTION':<{col_widths['ACTION']}} "
-                      f"{'FROM/TO':<{col_widths['FROM/TO']}} "
-                      f"{'SERVICE':<{col_widths['SERVICE']}} "
-                      f"{'NOTE'}")
-        win.addstr(1, 2, header_str[:width-3], curses.A_BOLD)
+        win.addstr(1, 2, _HEADER_STR[:width-3], curses.A_BOLD)
         win.hline(2, 2, curses.ACS_HLINE, width - 4)
 
-        if not self.rules: win.addstr(4, 2, "No rules to display."); win.refresh(); return
+        if not self.rules: win.addstr(4, 2, "Loading rules..." if self._pending_proc else "No rules to display."); win.refresh(); return
 
         list_height = (height - 9) // 2 
         if self.selected_index < self.scroll_pos: self.scroll_pos = self.selected_index
         if self.selected_index >= self.scroll_pos + list_height: self.scroll_pos = self.selected_index - list_height + 1
 
         y_pos = 3
-        for i, rule in enumerate(self.rules[self.scroll_pos : self.scroll_pos + list_height]):
+        for i, line in enumerate(self._formatted_rows[self.scroll_pos : self.scroll_pos + list_height]):
             is_selected = i + self.scroll_pos == self.selected_index
-            
-            rule_num, rule_details = rule[0], rule[1]
-            rule_num_str = rule_num.strip("[] ")
-            note_display = "Yes" if rule_num_str in self.notes else "No"
-            service = self.services.get(rule_num_str, "")
 
-            to_part, action_part, from_part = rule_details, "", ""
-            action_match = re.search(r'\b(ALLOW|DENY|REJECT|LIMIT)\b(\s+IN)?(\s+OUT)?', rule_details)
-            if action_match:
-                action_str = action_match.group(0)
-                parts = rule_details.split(action_str, 1)
-                to_part = parts[0].strip()
-                action_part = action_str.strip()
-                from_full = parts[1].strip()
-                from_part = from_full.split()[0]
-            else: 
-                to_part = rule_details
-
-            line = (f"{rule_num:<{col_widths['#']}} "
-                    f"{to_part:<{col_widths['TO']}} "
-                    f"{action_part:<{col_widths['ACTION']}} "
-                    f"{from_part:<{col_widths['FROM/TO']}} "
-                    f"{service:<{col_widths['SERVICE']}} "
-                    f"{note_display}")
-            
             if is_selected:
                 win.addstr(y_pos, 2, " " * (width - 4), curses.color_pair(5))
                 win.addstr(y_pos, 2, line[:width-4], curses.color_pair(5) | curses.A_BOLD)
@@ -429,10 +543,15 @@ class UFWManager:
             footer_win.addstr(2, start_x, keys_right)
             footer_win.attroff(curses.color_pair(2) | curses.A_BOLD)
 
-        if self.status_message:
+        message = self._footer_text()
+        if message:
             footer_win.addstr(0, 1, ' ' * (width-2))
-            footer_win.addstr(0, 1, f"Status: {self.status_message}"[:width-2], curses.color_pair(3))
-            self.status_message = ""
+            footer_win.addstr(0, 1, f"Status: {message}"[:width-2], curses.color_pair(3))
+            if self._pending_proc is None: self.status_message = ""
+        self._footer_message = message
+
+    def _footer_text(self) -> str:
+        return self.status_message or ("Reloading..." if self._pending_proc is not None else "")
 
     # --- Main Application Loop ---
 
@@ -446,38 +565,63 @@ class UFWManager:
         stdscr.addstr(h // 2, (w - len(loading_text)) // 2, loading_text)
         stdscr.refresh()
         
-        self._get_firewall_rules()
+        self._kickoff_status()
+        if self._files_loader is not None:
+            self._files_loader.join()
+            self._files_loader = None
+
+        key_actions = {
+            ord('r'): self._reload_firewall,
+            ord('d'): lambda: self._delete_firewall_rule(stdscr),
+            ord('a'): lambda: self._add_or_edit_rule(stdscr, is_edit=False),
+            curses.KEY_ENTER: lambda: self._add_or_edit_rule(stdscr, is_edit=True),
+            ord('P'): lambda: self._panic_mode(stdscr),
+        }
+        for ch in 'rda': key_actions[ord(ch.upper())] = key_actions[ord(ch)]
+        for code in [10, 13]: key_actions[code] = key_actions[curses.KEY_ENTER]
 
         while True:
             h, w = stdscr.getmaxyx()
             if h < 15 or w < 80:
                 stdscr.clear(); stdscr.addstr(0, 0, "Terminal too small"); stdscr.refresh()
                 if stdscr.getch() == ord('q'): break
+                self._dirty = True
                 continue
 
+            stdscr.timeout(100 if self._pending_proc else 1000)
             key = stdscr.getch()
             if key in [ord('q'), ord('Q')]: break
+            # Polled after getch so a finished fetch is painted on this tick, not the next one
+            self._poll_status()
 
-            if key == curses.KEY_UP: self.selected_index = max(0, self.selected_index - 1)
-            elif key == curses.KEY_DOWN and self.rules: self.selected_index = min(len(self.rules) - 1, self.selected_index + 1)
-            elif key in [ord('r'), ord('R')]: self._reload_firewall()
-            elif key in [ord('d'), ord('D')]: self._delete_firewall_rule(stdscr)
-            elif key in [ord('a'), ord('A')]: self._add_or_edit_rule(stdscr, is_edit=False)
-            elif key in [curses.KEY_ENTER, 10, 13]: self._add_or_edit_rule(stdscr, is_edit=True)
-            elif key == ord('P'): self._panic_mode(stdscr)
-            if key == -1: 
-                self._get_firewall_rules()
-                self._setup_and_load_files()
+            if key == -1: pass
+            elif key == curses.KEY_UP: self.selected_index = max(0, self.selected_index - 1)
+            elif key == curses.KEY_DOWN:
+                if self.rules: self.selected_index = min(len(self.rules) - 1, self.selected_index + 1)
+            else:
+                action = key_actions.get(key)
+                if action: action()
+            if key != -1 or self._footer_text() != self._footer_message: self._dirty = True
 
-            stdscr.erase(); self._draw_header(stdscr, w); self._draw_main_window(stdscr, h, w); self._draw_footer(stdscr, h, w); stdscr.refresh()
+            if self._dirty:
+                self._dirty = False
+                stdscr.erase(); self._draw_header(stdscr, w); self._draw_main_window(stdscr, h, w); self._draw_footer(stdscr, h, w)
+            else:
+                self._draw_clock(stdscr, w)
+            stdscr.noutrefresh(); curses.doupdate()
 
     def run(self):
+        self._files_loader = threading.Thread(target=self._setup_and_load_files, daemon=True)
+        self._files_loader.start()
         try:
+            # Ask for the sudo password up front, on the plain terminal, so background fetches don't need to.
+            try: subprocess.run(['sudo', '-v'])
+            except OSError: pass
             curses.wrapper(self._app_loop)
         except KeyboardInterrupt: pass
         finally:
             # --- MODIFIED: Clear screen and print a graceful exit message ---
-            os.system('clear')
+            sys.stdout.write('\033[H\033[2J'); sys.stdout.flush()
             print("\n=== UFW Manager terminated gracefully ===\n")
 
 if __name__ == "__main__":